@@ -25,7 +25,7 @@ def diamond_square(
 
 
     :param rng: A NumPy random number generator for reproducible randomness.
-    :param square_size: The edge length of the basic square.
+    :param square_size: The edge length of the basic square. Must be a power of two.
     :param num_squares: The number of squares to generate along each axis.
     :param primary_scale: The primary scaling factor(s) for height variation.
         This can be a single float or a NumPy array matching the terrain dimensions.
@@ -33,7 +33,7 @@ def diamond_square(
         This can be a single float or a NumPy array matching the terrain dimensions.
     :param base_level: The base level height for the terrain. (default 0)
 
-    :return: A 2D NumPy array representing the generated terrain heightmap.
+    :return: A 2D ``float32`` NumPy array representing the generated terrain heightmap.
         Its dimensions are ``num_squares[0] * square_size + 1`` by ``num_squares[1] * square_size + 1`` samples.
     :rtype: np.ndarray
 
@@ -59,75 +59,109 @@ def diamond_square(
                                   roughness=1)
     """
 
+    assert (
+        square_size > 0 and square_size & (square_size - 1) == 0
+    ), "square_size must be a power of two"
+
     sz = square_size
-    h = np.zeros((num_squares[0] * sz + 1, num_squares[1] * sz + 1))
+    h = np.zeros((num_squares[0] * sz + 1, num_squares[1] * sz + 1), dtype=np.float32)
 
-    # Cast primary_scale & roughness to 2D arrays
+    # Cast primary_scale & roughness to 2D float32 arrays
     if not isinstance(primary_scale, np.ndarray):
         primary_scale = np.full_like(h, primary_scale)
     else:
         assert primary_scale.shape == h.shape
+        primary_scale = np.asarray(primary_scale, dtype=np.float32)
 
     if not isinstance(roughness, np.ndarray):
         roughness = np.full_like(h, roughness)
     else:
         assert roughness.shape == h.shape
+        roughness = np.asarray(roughness, dtype=np.float32)
 
     # sample primary_scale at corner positions and use it to scale an exponential distribution
     corner_scale = primary_scale[
         0 : num_squares[0] * sz + 1 : sz, 0 : num_squares[1] * sz + 1 : sz
     ]
-    corner_values = base_level + rng.exponential(scale=corner_scale)
+    corner_values = rng.standard_exponential(size=corner_scale.shape, dtype=np.float32)
+    corner_values *= corner_scale
+    corner_values += base_level
 
     # for displacement, we go for normal distribution
-    randoms = primary_scale * roughness * rng.normal(size=primary_scale.shape)
+    randoms = primary_scale * roughness
+    randoms *= rng.standard_normal(size=primary_scale.shape, dtype=np.float32)
 
     # start with the corners
-    for i, j in np.ndindex((num_squares[0] + 1, num_squares[1] + 1)):
-        h[i * sz, j * sz] = corner_values[i, j]
+    h[::sz, ::sz] = corner_values
 
     # the interpolation distance starts at sqrt(2) * sz (diagonal of one square)
     # and diminishes by a factor of sqrt(2) every half-step
-    current_scale = np.sqrt(2)
+    # (kept in float32 so that it does not promote the float32 arrays it multiplies)
+    sqrt2 = np.sqrt(np.float32(2))
+    current_scale = sqrt2
 
     while sz >= 2:
-        assert sz % 2 == 0
-
-        # "diamond" step
-        for i, j in np.ndindex(num_squares):
-            # sample 4 corners
-            c1 = h[i * sz, j * sz]
-            c2 = h[i * sz, (j + 1) * sz]
-            c3 = h[(i + 1) * sz, (j + 1) * sz]
-            c4 = h[(i + 1) * sz, j * sz]
-            c = np.mean([c1, c2, c3, c4])
-
-            displacement = current_scale * randoms[i * sz + sz // 2, j * sz + sz // 2]
-            h[i * sz + sz // 2, j * sz + sz // 2] = c + displacement
-
-        num_squares = (num_squares[0] * 2, num_squares[1] * 2)
+        centers = _diamond_step(h, randoms, sz, current_scale)
         sz //= 2
-        current_scale /= np.sqrt(2)
+        current_scale /= sqrt2
 
-        # "square" step
-        for j in range(0, num_squares[1] + 1):
-            if j % 2 == 0:
-                irange = range(1, num_squares[0], 2)
-            else:
-                irange = range(0, num_squares[0] + 1, 2)
+        _square_step(h, centers, randoms, sz, current_scale)
+        current_scale /= sqrt2
 
-            for i in irange:
-                # sample 4 directions
-                nan = float("NaN")
-                c1 = h[(i - 1) * sz, j * sz] if i > 0 else nan
-                c2 = h[i * sz, (j - 1) * sz] if j > 0 else nan
-                c3 = h[(i + 1) * sz, j * sz] if i < num_squares[0] - 1 else nan
-                c4 = h[i * sz, (j + 1) * sz] if j < num_squares[1] - 1 else nan
-                c = np.nanmean([c1, c2, c3, c4])
-
-                displacement = current_scale * randoms[i * sz, j * sz]
-                h[i * sz, j * sz] = c + displacement
+    return h
 
-        current_scale /= np.sqrt(2)
 
-    return h
+def _diamond_step(
+    h: np.ndarray, randoms: np.ndarray, sz: int, scale: np.float32
+) -> np.ndarray:
+    # All square centers at once, from the 4 corners of each square.
+    # Sums are accumulated in place in a single contiguous buffer, which is then
+    # stored into h in one go. The buffer is returned so that the following square
+    # step can read the centers from it instead of gathering them from h again.
+    c = h[0:-1:sz, 0:-1:sz] + h[0:-1:sz, sz::sz]
+    c += h[sz::sz, sz::sz]
+    c += h[sz::sz, 0:-1:sz]
+    c /= 4
+    c += scale * randoms[sz // 2 :: sz, sz // 2 :: sz]
+    h[sz // 2 :: sz, sz // 2 :: sz] = c
+    return c
+
+
+def _square_step(
+    h: np.ndarray, centers: np.ndarray, randoms: np.ndarray, sz: int, scale: np.float32
+) -> None:
+    # Every edge midpoint is the mean of its (up to 4) neighbours in the cardinal
+    # directions, which are always corners or square centers.
+    # `centers` holds the square centers computed by the preceding diamond step.
+    # Missing neighbours are skipped in the sum and left out of the count.
+    # Note that, as before, the far neighbour of the second-to-last midpoint
+    # along each axis is also left out.
+    corners = h[:: 2 * sz, :: 2 * sz]
+
+    # midpoints between vertically adjacent corners
+    m = corners[:-1, :].copy()
+    m[:, 1:] += centers
+    m[:-1, :] += corners[1:-1, :]
+    m[:, :-1] += centers
+
+    # divide by the number of neighbours summed (4 inside, fewer along edges)
+    m[:-1, 1:-1] /= 4
+    m[:-1, [0, -1]] /= 3
+    m[-1, 1:-1] /= 3
+    m[-1, [0, -1]] /= 2
+    m += scale * randoms[sz :: 2 * sz, :: 2 * sz]
+    h[sz :: 2 * sz, :: 2 * sz] = m
+
+    # midpoints between horizontally adjacent corners
+    m = corners[:, :-1].copy()
+    m[1:, :] += centers
+    m[:-1, :] += centers
+    m[:, :-1] += corners[:, 1:-1]
+
+    # divide by the number of neighbours summed (4 inside, fewer along edges)
+    m[1:-1, :-1] /= 4
+    m[[0, -1], :-1] /= 3
+    m[1:-1, -1] /= 3
+    m[[0, -1], -1] /= 2
+    m += scale * randoms[:: 2 * sz, sz :: 2 * sz]
+    h[:: 2 * sz, sz :: 2 * sz] = m
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from numpy.random import Generator, PCG64
 
 from procgenlib.synthesis import diamond_square
@@ -13,15 +14,15 @@ def test_diamond_square():
 
     expected_result = np.array(
         [
-            [0.184, 0.021, 0.042, 0.884, 1.149, 1.515, 2.891, 2.865, 0.645],
-            [0.805, 0.393, 0.548, 0.974, 0.896, 1.971, 2.725, 2.354, 1.500],
-            [1.161, 0.433, 0.844, 0.945, 0.745, 1.659, 2.285, 2.596, 1.725],
-            [1.280, 0.958, 0.860, 0.766, 1.290, 1.717, 1.477, 1.184, 1.394],
-            [1.100, 1.512, 2.081, 1.526, 1.391, 1.163, 1.382, 1.539, 1.079],
-            [1.700, 2.038, 2.201, 1.958, 1.579, 1.269, 0.791, 1.042, 0.645],
-            [1.908, 2.088, 2.449, 2.014, 1.161, 1.005, 0.266, 0.292, 1.017],
-            [2.275, 3.220, 2.214, 2.014, 1.193, 1.225, 0.701, 0.210, 0.568],
-            [4.690, 3.528, 2.911, 2.677, 2.817, 1.386, 0.644, 0.631, 0.419],
+            [2.114, 2.369, 1.880, 1.903, 1.308, 0.932, 0.828, 0.351, 0.642],
+            [2.328, 2.187, 2.170, 1.571, 0.918, 1.363, 1.221, 0.368, 0.852],
+            [2.474, 2.030, 2.826, 1.989, 1.673, 1.122, 0.645, 0.564, 0.420],
+            [2.321, 2.279, 2.030, 1.733, 1.546, 1.042, 1.324, 0.716, 1.049],
+            [1.728, 1.907, 1.719, 1.800, 1.658, 1.167, 1.471, 0.995, 0.923],
+            [2.127, 2.322, 1.200, 1.159, 1.322, 1.563, 1.569, 1.226, 1.102],
+            [1.973, 1.700, 0.828, 1.224, 0.965, 1.447, 1.824, 0.954, 0.851],
+            [1.157, 0.927, 1.230, 1.277, 1.734, 2.133, 1.416, 0.539, 0.518],
+            [1.156, 1.221, 1.259, 1.826, 2.698, 2.102, 1.650, 1.536, 0.570],
         ]
     )
 
@@ -29,3 +30,66 @@ def test_diamond_square():
     # print(np.array2string(result, separator=", ", formatter={"float_kind": lambda x: "%.3f" % x}))
 
     assert np.max(np.abs(result - expected_result)) < 1e-3
+
+
+def test_diamond_square_rectangular():
+    rng = Generator(PCG64(54321))
+
+    y, x = np.mgrid[0:9, 0:13]
+
+    result = diamond_square(
+        rng,
+        square_size=4,
+        num_squares=(2, 3),
+        primary_scale=1 + x / 12,
+        roughness=np.full((9, 13), 0.5),
+        base_level=10,
+    )
+
+    # fmt: off
+    expected_result = np.array(
+        [
+            [10.023, 11.356, 11.424, 12.135, 12.749, 12.263, 12.238, 11.784, 10.321, 12.289, 12.792, 12.256, 11.393],
+            [10.744, 11.585, 11.890, 12.082, 12.507, 12.207, 12.568, 12.437, 12.651, 12.748, 12.678, 11.950, 12.246],
+            [10.540, 11.385, 11.229, 11.923, 11.368, 11.545, 12.542, 11.774, 11.976, 12.012, 12.880, 12.675, 12.552],
+            [10.784, 11.044, 11.520, 11.260, 11.202, 11.360, 12.241, 11.750, 11.233, 11.775, 10.906, 11.874, 12.048],
+            [10.626, 11.283, 11.517, 11.094, 11.260, 11.070, 11.896, 11.297, 10.065, 10.421, 11.477, 10.691, 12.738],
+            [11.384, 11.914, 12.406, 11.846, 11.325, 10.706, 11.906, 11.439, 10.905, 11.512, 11.462, 11.195, 11.778],
+            [11.762, 12.598, 13.500, 12.256, 12.431, 11.147, 10.658, 11.339, 11.041, 11.709, 12.090, 12.061, 11.188],
+            [11.848, 12.536, 12.472, 11.938, 11.900, 10.739, 10.457,  9.940,  9.959, 10.464, 11.728, 10.572, 10.320],
+            [12.197, 12.036, 11.509, 10.604, 10.578,  9.904,  9.973, 10.333, 10.677, 10.741, 10.543, 10.624, 11.126],
+        ]
+    )
+    # fmt: on
+
+    assert result.shape == (9, 13)
+    assert result.dtype == np.float32
+    assert np.max(np.abs(result - expected_result)) < 1e-3
+
+
+def test_diamond_square_integer_scales():
+    rng = Generator(PCG64(12345))
+
+    result = diamond_square(
+        rng,
+        square_size=4,
+        num_squares=(2, 3),
+        primary_scale=np.full((9, 13), 2, dtype=int),
+        roughness=np.full((9, 13), 1, dtype=int),
+    )
+
+    assert result.shape == (9, 13)
+    assert result.dtype == np.float32
+
+
+def test_diamond_square_rejects_non_power_of_two():
+    rng = Generator(PCG64(12345))
+    state = rng.bit_generator.state
+
+    with pytest.raises(AssertionError):
+        diamond_square(
+            rng, square_size=6, num_squares=(1, 1), primary_scale=1, roughness=1
+        )
+
+    # the check must fire before any random numbers are drawn
+    assert rng.bit_generator.state == state